@@ -5,15 +5,17 @@ import os
 import traceback
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
 import pandas as pd
 import math
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from streamlit_folium import st_folium
 import folium
 import plotly.graph_objects as go
-import io
 
 st.set_page_config(page_title="AirLens — NASA / TEMPO Demo (v2)", layout="wide", initial_sidebar_state="expanded")
 
@@ -47,9 +49,11 @@ PALETTE = {
 }
 
 # --------------------------
-# Robust app-wide CSS
+# Robust app-wide CSS — built once per process, not per rerun
 # --------------------------
-CSS = f"""
+@st.cache_resource(show_spinner=False)
+def _build_css():
+    return f"""
 <style>
 :root {{
   --bg: {PALETTE['bg']};
@@ -134,7 +138,7 @@ a, a:link {{ color: var(--accent); }}
 </style>
 """
 
-st.markdown(CSS, unsafe_allow_html=True)
+st.markdown(_build_css(), unsafe_allow_html=True)
 
 # --------------------------
 # Earth Engine (optional)
@@ -158,6 +162,25 @@ except Exception as imp_e:
     EE_AVAILABLE = False
     EE_INIT_ERROR = str(imp_e)
 
+# --------------------------
+# Numba (optional) — compiled forecast kernel, plain-Python fallback
+# --------------------------
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except Exception:
+    def njit(*dargs, **dkwargs):
+        if dargs and callable(dargs[0]):
+            return dargs[0]
+        def _wrap(f):
+            return f
+        return _wrap
+
+# single RNG for all non-deterministic draws — avoids re-allocating
+# BitGenerator state on every sparkline/forecast rerun
+_RNG = np.random.default_rng()
+
 # --------------------------
 # Pollutant units
 # --------------------------
@@ -174,22 +197,30 @@ POLLUTANT_UNITS = {
 # Helpers
 # --------------------------
 
+# shared session: keep-alive + pooled TLS connections across the many OpenAQ /
+# Open-Meteo calls per rerun (thread-safe for the radius fan-out)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=1, backoff_factor=0.2)))
+
+
 def safe_get(url, params=None, timeout=10):
     try:
-        r = requests.get(url, params=params, timeout=timeout)
+        r = _SESSION.get(url, params=params, timeout=timeout)
         r.raise_for_status()
         return r
     except Exception:
         return None
 
 
+# compiled once — normalize_label runs per measurement row
+_NORM_RE = re.compile(r"[^a-z0-9]")
+_SUB_TABLE = str.maketrans({"₂": "2", "₃": "3", "₅": "5"})
+
+
 def normalize_label(lbl: str) -> str:
     if lbl is None:
         return ""
-    s = str(lbl).lower()
-    s = s.replace("₂", "2").replace("₃", "3").replace("₅", "5")
-    s = re.sub(r"[^a-z0-9]", "", s)
-    return s
+    return _NORM_RE.sub("", str(lbl).lower().translate(_SUB_TABLE))
 
 
 def iso_to_dt(s):
@@ -203,6 +234,26 @@ def iso_to_dt(s):
         except Exception:
             return None
 
+
+# helper: choose most recent measurement if available, otherwise median
+def choose_pm_value(entries):
+    if not entries:
+        return None, None
+    with_dt = []
+    without_dt = []
+    for e in entries:
+        d = iso_to_dt(e.get("ts"))
+        if d:
+            with_dt.append((d, e))
+        else:
+            without_dt.append(e)
+    if with_dt:
+        with_dt.sort(key=lambda x: x[0], reverse=True)
+        chosen = with_dt[0][1]
+        return chosen["value"], chosen.get("unit")
+    vals = [e["value"] for e in entries]
+    return float(np.median(vals)), entries[0].get("unit", "")
+
 # --------------------------
 # 24-hour PM2.5 fetch & helper
 # --------------------------
@@ -267,16 +318,10 @@ def fetch_24h_pm25_mean(lat, lon, radius_meters):
     except Exception:
         return None, 0, None
 
-# AQI conversion (EPA breakpoints)
-EPA_BP = [
-    (0.0, 12.0, 0, 50),
-    (12.1, 35.4, 51, 100),
-    (35.5, 55.4, 101, 150),
-    (55.5, 150.4, 151, 200),
-    (150.5, 250.4, 201, 300),
-    (250.5, 350.4, 301, 400),
-    (350.5, 500.4, 401, 500)
-]
+# AQI conversion (EPA breakpoints) — piecewise-linear, so np.interp does the
+# whole mapping in one C call (and vectorizes over the 24h forecast array)
+_AQI_PM_BP = np.array([0.0, 12.0, 35.4, 55.4, 150.4, 250.4, 350.4, 500.4])
+_AQI_VAL_BP = np.array([0, 50, 100, 150, 200, 300, 400, 500])
 
 
 def pm25_to_aqi(pm):
@@ -284,11 +329,7 @@ def pm25_to_aqi(pm):
         pm = float(pm)
     except Exception:
         return None
-    for (pm_l, pm_h, a_l, a_h) in EPA_BP:
-        if pm_l <= pm <= pm_h:
-            aqi = ((a_h - a_l)/(pm_h - pm_l)) * (pm - pm_l) + a_l
-            return int(round(aqi))
-    return 500
+    return int(round(np.interp(pm, _AQI_PM_BP, _AQI_VAL_BP)))
 
 
 def format_time_utc(dt=None):
@@ -297,24 +338,91 @@ def format_time_utc(dt=None):
     return dt.strftime("%Y-%m-%d %H:%M UTC")
 
 
+@njit(cache=True)
+def _forecast_kernel(current_pm, hours, sigma, seed):
+    # scalar random walk — compiled by numba when available (cache=True avoids
+    # the recompile cost on process restart)
+    out = np.empty(hours)
+    np.random.seed(seed)
+    last = current_pm
+    for i in range(hours):
+        last = max(0.1, last + np.random.normal(0.0, sigma))
+        out[i] = last
+    return out
+
+
 def hourly_forecast_pm(current_pm, hours=24, variance=0.03):
-    rng = np.random.default_rng(seed=int((float(current_pm) * 100) % 10000))
-    vals = []
-    last = float(current_pm)
-    for _ in range(hours):
-        last = max(0.1, last + rng.normal(0, max(0.2, float(current_pm) * variance)))
-        vals.append(round(last, 1))
-    return vals
+    pm = float(current_pm)
+    sigma = max(0.2, pm * variance)
+    seed = int((pm * 100) % 10000)
+    return [round(float(v), 1) for v in _forecast_kernel(pm, hours, sigma, seed)]
 
 
-def sparkline(vals):
-    fig = go.Figure(go.Scatter(y=vals, mode="lines", line=dict(width=2, color=PALETTE['accent']), fill='tozeroy'))
+# figure skeletons built once per process; renders only swap in fresh data,
+# skipping the repeated layout-dict construction and validation
+@st.cache_resource(show_spinner=False)
+def _sparkline_skeleton():
+    fig = go.Figure(go.Scatter(y=[], mode="lines", line=dict(width=2, color=PALETTE['accent']), fill='tozeroy'))
     fig.update_layout(margin=dict(t=2,b=2,l=2,r=2), height=60, paper_bgcolor='rgba(0,0,0,0)', xaxis=dict(visible=False), yaxis=dict(visible=False))
     return fig
 
+
+def sparkline(vals):
+    fig = _sparkline_skeleton()
+    fig.data[0].y = vals
+    return fig
+
+
+@st.cache_resource(show_spinner=False)
+def _gauge_skeleton():
+    fig = go.Figure(go.Indicator(mode="gauge+number", value=0, title={'text': "AQI (from PM2.5)"},
+                                gauge={'axis': {'range': [0,300]},
+                                       'bar': {'color': PALETTE['accent']},
+                                       'steps': [
+                                           {'range':[0,50], 'color': PALETTE['good']},
+                                           {'range':[50,100], 'color': PALETTE['moderate']},
+                                           {'range':[100,150], 'color': '#F97316'},
+                                           {'range':[150,300], 'color': PALETTE['unhealthy']}
+                                       ]}))
+    fig.update_layout(height=330, paper_bgcolor='rgba(0,0,0,0)', font=dict(color=PALETTE['text']))
+    return fig
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _build_map(lat, lon, aqi, aod, color, src):
+    # folium -> Leaflet HTML serialization is the real cost here; build once
+    # per unique (location, AQI, AOD) tuple and reuse across reruns
+    fmap = folium.Map(location=[lat, lon], zoom_start=8, tiles=PALETTE['map_tiles'])
+    folium.Circle(location=[lat, lon], radius=7000 + aqi * 40, color=color, fill=True, fill_opacity=0.28, popup=f"AQI: {aqi}").add_to(fmap)
+    folium.Marker([lat + 0.02, lon + 0.02], popup=f"Satellite proxy AOD: {aod} — {src}").add_to(fmap)
+    return fmap
+
+
+@st.cache_data(show_spinner=False)
+def snapshot_csv(location, lat, lon, polls_tuple, aqi, aqi_pm25_used, aqi_source, ts):
+    # keyed on the scalar inputs so the DataFrame build + encode runs once per
+    # distinct snapshot, not on every widget tweak
+    pm25, pm10, no2, so2, o3, co = polls_tuple
+    return pd.DataFrame([{
+        "location": location,
+        "lat": lat,
+        "lon": lon,
+        "pm25": pm25,
+        "pm10": pm10,
+        "no2": no2,
+        "so2": so2,
+        "o3": o3,
+        "co": co,
+        "aqi": aqi,
+        "aqi_pm25_used": aqi_pm25_used,
+        "aqi_source": aqi_source,
+        "timestamp": ts
+    }]).to_csv(index=False).encode()
+
 # --------------------------
 # Satellite / TEMPO helpers (EE)
 # --------------------------
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
 def get_tempo_no2_via_ee(lat, lon, days_back=2):
     try:
         if not EE_AVAILABLE:
@@ -333,6 +441,7 @@ def get_tempo_no2_via_ee(lat, lon, days_back=2):
     except Exception:
         return None
 
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
 def get_modis_aod_via_ee(lat, lon, days_back=2):
     try:
         if not EE_AVAILABLE:
@@ -357,7 +466,11 @@ def tempo_to_aod_proxy_from_no2(no2_col):
         return None
 
 
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
 def fetch_satellite_proxy(lat, lon):
+    # round coords so nearby queries share a cache entry; EE getInfo() is a
+    # synchronous server round-trip and dominates page load when EE is on
+    lat, lon = round(float(lat), 3), round(float(lon), 3)
     if EE_AVAILABLE:
         try:
             no2 = get_tempo_no2_via_ee(lat, lon)
@@ -378,77 +491,115 @@ def fetch_satellite_proxy(lat, lon):
 # --------------------------
 # OpenAQ adaptive search
 # --------------------------
-def fetch_openaq_adaptive(lat, lon, radii=[5000, 20000, 50000, 100000, 200000]):
+def _fan_out_radii(fetch_one, radii):
+    """Fire one request per radius concurrently and return (radius, json) for
+    the smallest radius with a usable payload; remaining futures are cancelled."""
+    with ThreadPoolExecutor(max_workers=len(radii)) as ex:
+        futures = [(r, ex.submit(fetch_one, r)) for r in radii]
+        hit = None
+        for r, fut in futures:
+            if hit is not None:
+                fut.cancel()
+                continue
+            try:
+                j = fut.result()
+            except Exception:
+                j = None
+            if isinstance(j, dict) and j.get("results"):
+                hit = (r, j)
+    return hit or (None, None)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_openaq_adaptive(lat, lon, radii=(5000, 20000, 50000, 100000, 200000)):
     base_latest = "https://api.openaq.org/v2/latest"
     base_meas = "https://api.openaq.org/v2/measurements"
-    # 1) try latest (fast)
-    for r in radii:
-        try:
-            params = {"coordinates": f"{lat},{lon}", "radius": r, "limit": 100}
-            resp = safe_get(base_latest, params=params)
-            if not resp:
-                continue
-            j = resp.json()
-            results = j.get("results", [])
-            if results:
-                for res in results:
-                    if res.get("measurements"):
-                        parsed = []
-                        for m in res.get("measurements", []):
-                            p = m.get("parameter")
-                            v = m.get("value")
-                            dt = None
-                            if isinstance(m.get("date"), dict):
-                                dt = m["date"].get("utc") or m["date"].get("local")
-                            if not dt:
-                                dt = m.get("lastUpdated")
-                            parsed.append({"parameter": p, "value": v, "lastUpdated": dt, "unit": m.get("unit")})
-                        return res, r, parsed, "latest"
-        except Exception:
-            continue
-    # 2) try measurements for short-term mean (slower but more reliable for concentration)
-    for r in radii:
+    # 1) try latest (fast) — all radii in parallel, keep smallest non-empty
+    def _probe_latest(radius):
+        resp = safe_get(base_latest, params={"coordinates": f"{lat},{lon}", "radius": radius, "limit": 100})
+        return resp.json() if resp else None
+
+    r, j = _fan_out_radii(_probe_latest, radii)
+    if j is not None:
         try:
-            params = {"coordinates": f"{lat},{lon}", "radius": r, "limit": 200, "date_from": (datetime.utcnow() - timedelta(days=30)).strftime("%Y-%m-%d")}
-            resp = safe_get(base_meas, params=params)
-            if not resp:
-                continue
-            j = resp.json()
-            meas = j.get("results", [])
-            if meas:
-                by_loc = {}
-                for m in meas:
-                    loc = m.get("location")
-                    if loc not in by_loc:
-                        by_loc[loc] = {"measurements": [], "coords": m.get("coordinates")}
-                    by_loc[loc]["measurements"].append(m)
-                best_loc = max(by_loc.items(), key=lambda x: len(x[1]["measurements"]))[0]
-                best = by_loc[best_loc]
-                params_seen = {}
-                latest_ts = {}
-                for m in best["measurements"]:
-                    p = m.get("parameter")
-                    v = m.get("value")
-                    if p and isinstance(v, (int, float)):
-                        params_seen.setdefault(p, []).append(v)
+            for res in j.get("results", []):
+                if res.get("measurements"):
+                    parsed = []
+                    for m in res.get("measurements", []):
+                        p = m.get("parameter")
+                        v = m.get("value")
                         dt = None
                         if isinstance(m.get("date"), dict):
                             dt = m["date"].get("utc") or m["date"].get("local")
                         if not dt:
                             dt = m.get("lastUpdated")
-                        if dt:
-                            if p not in latest_ts or dt > latest_ts[p]:
-                                latest_ts[p] = dt
-                parsed = []
-                for p, arr in params_seen.items():
-                    measures_avg = float(np.mean(arr))
-                    parsed.append({"parameter": p, "value": round(measures_avg, 2), "lastUpdated": latest_ts.get(p)})
-                pseudo = {"location": best_loc, "coordinates": best.get("coords"), "measurements": parsed}
+                        parsed.append({"parameter": p, "value": v, "lastUpdated": dt, "unit": m.get("unit")})
+                    return res, r, parsed, "latest"
+        except Exception:
+            pass
+    # 2) try measurements for short-term mean (slower but more reliable for concentration)
+    def _probe_meas(radius):
+        resp = safe_get(base_meas, params={"coordinates": f"{lat},{lon}", "radius": radius, "limit": 200, "date_from": (datetime.utcnow() - timedelta(days=30)).strftime("%Y-%m-%d")})
+        return resp.json() if resp else None
+
+    r, j = _fan_out_radii(_probe_meas, radii)
+    if j is not None:
+        try:
+            meas = j.get("results", [])
+            if meas:
+                # vectorized aggregation: pick the busiest station, then
+                # per-parameter means + latest timestamps in one groupby each
+                mdf = pd.DataFrame(meas)
+                mdf["lastUpdated"] = [
+                    (m["date"].get("utc") or m["date"].get("local")) if isinstance(m.get("date"), dict) else m.get("lastUpdated")
+                    for m in meas
+                ]
+                best_loc = mdf["location"].value_counts().idxmax()
+                sub = mdf[mdf["location"] == best_loc].copy()
+                sub["value"] = pd.to_numeric(sub["value"], errors="coerce")
+                sub = sub[sub["value"].notna() & sub["parameter"].notna()]
+                means = sub.groupby("parameter")["value"].mean().round(2)
+                latest_ts = sub.groupby("parameter")["lastUpdated"].max()
+                parsed = [{"parameter": p, "value": float(v), "lastUpdated": latest_ts.get(p)} for p, v in means.items()]
+                coords = next((m.get("coordinates") for m in meas if m.get("location") == best_loc), None)
+                pseudo = {"location": best_loc, "coordinates": coords, "measurements": parsed}
                 return pseudo, r, parsed, "pseudo"
         except Exception:
-            continue
+            pass
     return None, None, [], None
 
+# --------------------------
+# Cached weather + pm history fetchers (avoid re-hitting APIs on every rerun)
+# --------------------------
+@st.cache_data(ttl=900, show_spinner=False)
+def fetch_current_weather(lat, lon):
+    wr = safe_get("https://api.open-meteo.com/v1/forecast", params={"latitude": lat, "longitude": lon, "current_weather": True})
+    if not wr:
+        return None
+    try:
+        wj = wr.json()
+        cw = wj.get("current_weather", {})
+        return {"temp": cw.get("temperature"), "windspeed": cw.get("windspeed"), "winddir": cw.get("winddirection")}
+    except Exception:
+        return None
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def fetch_pm_history(lat, lon, radius):
+    hist = []
+    try:
+        mr = safe_get("https://api.openaq.org/v2/measurements", params={"coordinates": f"{lat},{lon}", "radius": radius or 20000, "limit": 200, "date_from": (datetime.utcnow() - timedelta(days=3)).strftime("%Y-%m-%d")})
+        if mr:
+            mj = mr.json()
+            for item in mj.get("results", []):
+                if normalize_label(item.get("parameter")) == "pm25":
+                    v = item.get("value")
+                    if isinstance(v, (int, float)):
+                        hist.append(v)
+    except Exception:
+        return []
+    return hist
+
 # --------------------------
 # UI controls
 # --------------------------
@@ -461,7 +612,13 @@ pm25_correction = st.sidebar.slider("PM2.5 correction factor", 0.5, 1.5, 1.0, st
 # --------------------------
 # Header + provenance
 # --------------------------
-st.markdown(f'<div class="header-card"><div style="display:flex;align-items:center;justify-content:space-between"><div><div style="font-size:26px;font-weight:900">AirLens</div><div style="font-size:13px;opacity:0.95">Integrates ground stations & satellite (TEMPO) — demo-ready</div></div><div style="text-align:right"><div style="font-weight:700;font-size:13px">{("EE ON" if EE_AVAILABLE else "EE OFF — demo fallback")}</div><div style="font-size:12px;opacity:0.85">Last update: {format_time_utc()}</div></div></div></div>', unsafe_allow_html=True)
+@st.cache_resource(show_spinner=False)
+def _build_header_html(ee_on):
+    # static skeleton cached per EE status; only the {ts} slot changes per rerun
+    status = "EE ON" if ee_on else "EE OFF — demo fallback"
+    return '<div class="header-card"><div style="display:flex;align-items:center;justify-content:space-between"><div><div style="font-size:26px;font-weight:900">AirLens</div><div style="font-size:13px;opacity:0.95">Integrates ground stations & satellite (TEMPO) — demo-ready</div></div><div style="text-align:right"><div style="font-weight:700;font-size:13px">' + status + '</div><div style="font-size:12px;opacity:0.85">Last update: {ts}</div></div></div></div>'
+
+st.markdown(_build_header_html(EE_AVAILABLE).format(ts=format_time_utc()), unsafe_allow_html=True)
 
 with st.expander("Data provenance & notes (click to expand)", expanded=False):
     st.markdown("""
@@ -515,186 +672,195 @@ st.session_state.last_location = selected_location
 # --------------------------
 # Fetch ground (OpenAQ) + weather + satellite proxy
 # --------------------------
-st.info("Loading data (ground stations, weather, satellite)...")
+@st.cache_data(ttl=300, show_spinner=False)
+def load_location_bundle(loc_name, lat, lon, use_adaptive, pm25_correction):
+    """Ground + weather + satellite bundle for one location.
 
-res, used_radius, parsed_measures, source_type = fetch_openaq_adaptive(lat, lon) if use_adaptive else fetch_openaq_adaptive(lat, lon, radii=[20000])
-if res is None:
-    res = {}
-
-# prepare pollutant slots
-polls = {"pm25": None, "pm10": None, "no2": None, "so2": None, "o3": None, "co": None}
-live_flags = {k: False for k in polls}
-used_pm_source = "fallback"  # will be set to '24h_mean' or 'latest' etc.
-pm25_24h_count = 0
-pm25_24h_mean_val = None
-
-# Build polling raw lists (if any parsed_measures exist)
-polls_raw = {k: [] for k in polls.keys()}
-if parsed_measures:
-    for m in parsed_measures:
-        key = normalize_label(m.get("parameter"))
-        val = m.get("value")
-        ts = m.get("lastUpdated")
-        unit = m.get("unit") or m.get("unitName") or ""
-        if isinstance(unit, str):
-            unit = unit.strip().lower()
-        # only keep numeric values
-        if key in polls and val is not None:
-            num = None
-            try:
-                num = float(val)
-            except Exception:
+    Pure function of its arguments within the TTL window — switching between
+    the preset locations becomes a cache lookup instead of a fetch pipeline.
+    """
+    res, used_radius, parsed_measures, source_type = fetch_openaq_adaptive(lat, lon) if use_adaptive else fetch_openaq_adaptive(lat, lon, radii=(20000,))
+    if res is None:
+        res = {}
+
+    # prepare pollutant slots
+    polls = {"pm25": None, "pm10": None, "no2": None, "so2": None, "o3": None, "co": None}
+    live_flags = {k: False for k in polls}
+    used_pm_source = "fallback"  # will be set to '24h_mean' or 'latest' etc.
+    pm25_24h_count = 0
+    pm25_24h_mean_val = None
+
+    # Build polling raw lists (if any parsed_measures exist)
+    polls_raw = {k: [] for k in polls.keys()}
+    if parsed_measures:
+        for m in parsed_measures:
+            key = normalize_label(m.get("parameter"))
+            val = m.get("value")
+            ts = m.get("lastUpdated")
+            unit = m.get("unit") or m.get("unitName") or ""
+            if isinstance(unit, str):
+                unit = unit.strip().lower()
+            # only keep numeric values
+            if key in polls and val is not None:
+                num = None
                 try:
-                    num = float(str(val).replace(",", ""))
+                    num = float(val)
                 except Exception:
-                    num = None
-            if num is not None:
-                polls_raw[key].append({"value": num, "unit": unit, "ts": ts})
+                    try:
+                        num = float(str(val).replace(",", ""))
+                    except Exception:
+                        num = None
+                if num is not None:
+                    polls_raw[key].append({"value": num, "unit": unit, "ts": ts})
+
+    # 1) Try robust 24h mean using expanding radii (preferred for AQI accuracy)
+    radii_try = [5000, 20000, 50000, 100000, 200000]
+    mean24 = None
+    cnt24 = 0
+    latest_ts24 = None
+    for r in radii_try:
+        try:
+            m24, c24, ts24 = fetch_24h_pm25_mean(lat, lon, r)
+            if m24 is not None and c24 > 0:
+                mean24 = m24
+                cnt24 = c24
+                latest_ts24 = ts24
+                used_radius = r
+                # if we have enough samples, stop expanding
+                if cnt24 >= MIN_SAMPLES_24H:
+                    break
+        except Exception:
+            continue
 
-# helper: choose most recent measurement if available, otherwise median
-def choose_pm_value(entries):
-    if not entries:
-        return None, None
-    with_dt = []
-    without_dt = []
-    for e in entries:
-        d = iso_to_dt(e.get("ts"))
-        if d:
-            with_dt.append((d, e))
+    # 2) Decide which PM2.5 to use for AQI
+    pm25_for_aqi = None
+    if mean24 is not None and cnt24 >= MIN_SAMPLES_24H:
+        # prefer 24h mean when enough samples exist
+        pm25_for_aqi = float(mean24) * float(pm25_correction)
+        used_pm_source = f"24h_mean (n={cnt24})"
+        pm25_24h_count = cnt24
+        pm25_24h_mean_val = mean24
+        # set displayed PM2.5 to the corrected 24h mean
+        polls["pm25"] = round(pm25_for_aqi, 1)
+        live_flags["pm25"] = True
+    else:
+        # fallback: use latest/representative sample from parsed_measures if available
+        rep_val, rep_unit = choose_pm_value(polls_raw.get("pm25", []))
+        if rep_val is not None:
+            # handle units
+            u = (rep_unit or "").lower()
+            if "mg" in u:
+                rep_val = rep_val * 1000.0
+            # apply correction
+            rep_val = float(rep_val) * float(pm25_correction)
+            polls["pm25"] = round(rep_val, 1)
+            pm25_for_aqi = rep_val
+            used_pm_source = "latest/representative"
+            # determine live flag based on timestamps and source_type
+            if source_type == "latest":
+                live_flags["pm25"] = True
+            else:
+                all_ts = [iso_to_dt(e.get("ts")) for e in polls_raw.get("pm25", []) if iso_to_dt(e.get("ts"))]
+                if all_ts:
+                    age_hr = (datetime.utcnow() - max(all_ts)).total_seconds() / 3600.0
+                    live_flags["pm25"] = age_hr <= 48.0
+                else:
+                    live_flags["pm25"] = False
         else:
-            without_dt.append(e)
-    if with_dt:
-        with_dt.sort(key=lambda x: x[0], reverse=True)
-        chosen = with_dt[0][1]
-        return chosen["value"], chosen.get("unit")
-    vals = [e["value"] for e in entries]
-    return float(np.median(vals)), entries[0].get("unit", "")
+            # last fallback: derive from pm10 or heuristic (keeps your existing fallback behaviour)
+            if polls.get("pm10") is not None:
+                try:
+                    fallback_val = round(float(polls["pm10"]) * 0.6, 1)
+                except Exception:
+                    fallback_val = round(5 + abs(math.sin(lat/12.0)) * 15, 1)
+            else:
+                fallback_val = round(5 + abs(math.sin(lat/12.0)) * 10, 1)
+            polls["pm25"] = float(fallback_val)
+            pm25_for_aqi = float(fallback_val)
+            used_pm_source = "fallback"
+            live_flags["pm25"] = False
 
-# 1) Try robust 24h mean using expanding radii (preferred for AQI accuracy)
-radii_try = [5000, 20000, 50000, 100000, 200000]
-mean24 = None
-cnt24 = 0
-latest_ts24 = None
-for r in radii_try:
-    try:
-        m24, c24, ts24 = fetch_24h_pm25_mean(lat, lon, r)
-        if m24 is not None and c24 > 0:
-            mean24 = m24
-            cnt24 = c24
-            latest_ts24 = ts24
-            used_radius = r
-            # if we have enough samples, stop expanding
-            if cnt24 >= MIN_SAMPLES_24H:
-                break
-    except Exception:
-        continue
-
-# 2) Decide which PM2.5 to use for AQI
-pm25_for_aqi = None
-if mean24 is not None and cnt24 >= MIN_SAMPLES_24H:
-    # prefer 24h mean when enough samples exist
-    pm25_for_aqi = float(mean24) * float(pm25_correction)
-    used_pm_source = f"24h_mean (n={cnt24})"
-    pm25_24h_count = cnt24
-    pm25_24h_mean_val = mean24
-    # set displayed PM2.5 to the corrected 24h mean
-    polls["pm25"] = round(pm25_for_aqi, 1)
-    live_flags["pm25"] = True
-else:
-    # fallback: use latest/representative sample from parsed_measures if available
-    rep_val, rep_unit = choose_pm_value(polls_raw.get("pm25", []))
-    if rep_val is not None:
-        # handle units
-        u = (rep_unit or "").lower()
-        if "mg" in u:
-            rep_val = rep_val * 1000.0
-        # apply correction
-        rep_val = float(rep_val) * float(pm25_correction)
-        polls["pm25"] = round(rep_val, 1)
-        pm25_for_aqi = rep_val
-        used_pm_source = "latest/representative"
-        # determine live flag based on timestamps and source_type
-        if source_type == "latest":
-            live_flags["pm25"] = True
-        else:
-            all_ts = [iso_to_dt(e.get("ts")) for e in polls_raw.get("pm25", []) if iso_to_dt(e.get("ts"))]
-            if all_ts:
-                age_hr = (datetime.utcnow() - max(all_ts)).total_seconds() / 3600.0
-                live_flags["pm25"] = age_hr <= 48.0
+    # Fill other pollutant slots using representative/latest logic (unchanged behaviour)
+    for pol in ["pm10", "no2", "so2", "o3", "co"]:
+        ents = polls_raw.get(pol, [])
+        if ents:
+            val, unit = choose_pm_value(ents)
+            if val is None:
+                continue
+            polls[pol] = round(val, 2)
+            if source_type == "latest":
+                live_flags[pol] = True
             else:
-                live_flags["pm25"] = False
-    else:
-        # last fallback: derive from pm10 or heuristic (keeps your existing fallback behaviour)
+                all_ts = [iso_to_dt(e.get("ts")) for e in ents if iso_to_dt(e.get("ts"))]
+                if all_ts:
+                    age_hr = (datetime.utcnow() - max(all_ts)).total_seconds() / 3600.0
+                    live_flags[pol] = age_hr <= 48.0
+                else:
+                    live_flags[pol] = False
+
+    # Ensure no None left (original fallback for missing values)
+    if polls["pm25"] is None:
         if polls.get("pm10") is not None:
             try:
-                fallback_val = round(float(polls["pm10"]) * 0.6, 1)
+                polls["pm25"] = round(float(polls["pm10"]) * 0.6, 1)
+                live_flags["pm25"] = False
             except Exception:
-                fallback_val = round(5 + abs(math.sin(lat/12.0)) * 15, 1)
-        else:
-            fallback_val = round(5 + abs(math.sin(lat/12.0)) * 10, 1)
-        polls["pm25"] = float(fallback_val)
-        pm25_for_aqi = float(fallback_val)
-        used_pm_source = "fallback"
-        live_flags["pm25"] = False
-
-# Fill other pollutant slots using representative/latest logic (unchanged behaviour)
-for pol in ["pm10", "no2", "so2", "o3", "co"]:
-    ents = polls_raw.get(pol, [])
-    if ents:
-        val, unit = choose_pm_value(ents)
-        if val is None:
-            continue
-        polls[pol] = round(val, 2)
-        if source_type == "latest":
-            live_flags[pol] = True
+                polls["pm25"] = round(5 + abs(math.sin(lat/12.0)) * 15, 1)
+                live_flags["pm25"] = False
         else:
-            all_ts = [iso_to_dt(e.get("ts")) for e in ents if iso_to_dt(e.get("ts"))]
-            if all_ts:
-                age_hr = (datetime.utcnow() - max(all_ts)).total_seconds() / 3600.0
-                live_flags[pol] = age_hr <= 48.0
-            else:
-                live_flags[pol] = False
+            polls["pm25"] = round(5 + abs(math.sin(lat/12.0)) * 10, 1)
+            live_flags["pm25"] = False
 
-# Ensure no None left (original fallback for missing values)
-if polls["pm25"] is None:
-    if polls.get("pm10") is not None:
+    # fill any remaining gaps in one vectorized draw instead of per-key RNG calls
+    missing = [k for k in polls if polls[k] is None and k != "pm25"]
+    if missing:
         try:
-            polls["pm25"] = round(float(polls["pm10"]) * 0.6, 1)
-            live_flags["pm25"] = False
+            vals = np.round(np.maximum(0.1, float(polls["pm25"]) * _RNG.uniform(0.6, 1.4, size=len(missing))), 1)
+            for k, v in zip(missing, vals):
+                polls[k] = float(v)
         except Exception:
-            polls["pm25"] = round(5 + abs(math.sin(lat/12.0)) * 15, 1)
-            live_flags["pm25"] = False
-    else:
-        polls["pm25"] = round(5 + abs(math.sin(lat/12.0)) * 10, 1)
-        live_flags["pm25"] = False
-
-for k in polls:
-    if polls[k] is None:
-        if k != "pm25":
-            try:
-                polls[k] = round(max(0.1, float(polls["pm25"]) * np.random.uniform(0.6, 1.4)), 1)
-                live_flags[k] = False
-            except Exception:
+            for k in missing:
                 polls[k] = "—"
-                live_flags[k] = False
+        for k in missing:
+            live_flags[k] = False
+
+    # weather (Open-Meteo)
+    weather = fetch_current_weather(lat, lon)
+
+    # satellite integration
+    aod_val, aod_source = fetch_satellite_proxy(lat, lon)
+    if aod_val is None:
+        aod_val = float(np.clip(float(polls["pm25"]) / 150.0, 0.03, 1.0))
+        if aod_source == "DEMO_FALLBACK":
+            aod_source = "PM2.5_proxy"
+
+    return {
+        "polls": polls,
+        "live_flags": live_flags,
+        "weather": weather,
+        "aod_val": aod_val,
+        "aod_source": aod_source,
+        "used_radius": used_radius,
+        "used_pm_source": used_pm_source,
+        "pm25_for_aqi": pm25_for_aqi,
+        "pm25_24h_count": pm25_24h_count,
+        "pm25_24h_mean_val": pm25_24h_mean_val,
+    }
 
-# weather (Open-Meteo)
-weather = None
-wr = safe_get("https://api.open-meteo.com/v1/forecast", params={"latitude": lat, "longitude": lon, "current_weather": True})
-if wr:
-    try:
-        wj = wr.json()
-        cw = wj.get("current_weather", {})
-        weather = {"temp": cw.get("temperature"), "windspeed": cw.get("windspeed"), "winddir": cw.get("winddirection")}
-    except Exception:
-        weather = None
 
-# satellite integration 
-aod_val, aod_source = fetch_satellite_proxy(lat, lon)
-if aod_val is None:
-    aod_val = float(np.clip(float(polls["pm25"]) / 150.0, 0.03, 1.0))
-    if aod_source == "DEMO_FALLBACK":
-        aod_source = "PM2.5_proxy"
+st.info("Loading data (ground stations, weather, satellite)...")
+
+_bundle = load_location_bundle(selected_location, lat, lon, use_adaptive, pm25_correction)
+polls = _bundle["polls"]
+live_flags = _bundle["live_flags"]
+weather = _bundle["weather"]
+aod_val = _bundle["aod_val"]
+aod_source = _bundle["aod_source"]
+used_radius = _bundle["used_radius"]
+used_pm_source = _bundle["used_pm_source"]
+pm25_for_aqi = _bundle["pm25_for_aqi"]
+pm25_24h_count = _bundle["pm25_24h_count"]
+pm25_24h_mean_val = _bundle["pm25_24h_mean_val"]
 
 # compute AQI
 try:
@@ -709,40 +875,32 @@ if aqi_now is None:
     except:
         aqi_now = 0
 
-# fetch short pm history for forecast if possible (unchanged)
-pm_history = []
-try:
-    mr = safe_get("https://api.openaq.org/v2/measurements", params={"coordinates": f"{lat},{lon}", "radius": used_radius or 20000, "limit": 200, "date_from": (datetime.utcnow() - timedelta(days=3)).strftime("%Y-%m-%d")})
-    if mr:
-        mj = mr.json()
-        for item in mj.get("results", []):
-            if normalize_label(item.get("parameter")) == "pm25":
-                v = item.get("value")
-                if isinstance(v, (int, float)):
-                    pm_history.append(v)
-except Exception:
-    pm_history = []
+# fetch short pm history for forecast if possible (cached); the request is
+# only worth making when the forecast is actually shown
+pm_history = fetch_pm_history(lat, lon, used_radius) if show_24h else []
 
 if show_24h:
     if len(pm_history) >= 6:
         base = float(pm_history[-1])
         trend = (pm_history[-1] - pm_history[0]) / max(1, len(pm_history)-1)
-        pm24 = [round(max(0.1, base + trend*(i+1) + np.random.normal(0, base*0.02)), 1) for i in range(24)]
+        trend_vec = trend * np.arange(1, 25)
+        noise = _RNG.normal(0, base*0.02, size=24)
+        pm24 = np.maximum(0.1, base + trend_vec + noise).round(1)
     else:
         pm24 = hourly_forecast_pm(polls["pm25"], 24, variance=forecast_var/100.0)
-    aqi24 = [pm25_to_aqi(x) for x in pm24]
+    aqi24 = np.interp(pm24, _AQI_PM_BP, _AQI_VAL_BP).round().astype(int).tolist()
 else:
     pm24 = []
     aqi24 = []
 
-# severity and advice 
+# severity and advice — breakpoint arrays + searchsorted instead of if-chains
+# (side chosen so boundary values land in the same bucket as before)
+_PM_SEV_BP = np.array([12.0, 35.4, 55.4, 150.4])
+_GEN_SEV_BP = np.array([30.0, 60.0, 100.0])
+
+
 def severity_idx_pm25(pm):
-    pm = float(pm)
-    if pm <= 12: return 0
-    if pm <= 35.4: return 1
-    if pm <= 55.4: return 2
-    if pm <= 150.4: return 3
-    return 4
+    return int(np.searchsorted(_PM_SEV_BP, float(pm), side='left'))
 
 sev = {}
 for k, v in polls.items():
@@ -750,8 +908,7 @@ for k, v in polls.items():
         if k == "pm25":
             sev[k] = severity_idx_pm25(v)
         else:
-            vv = float(v)
-            sev[k] = 0 if vv < 30 else (1 if vv < 60 else (2 if vv < 100 else 3))
+            sev[k] = int(np.searchsorted(_GEN_SEV_BP, float(v), side='right'))
     except:
         sev[k] = 0
 
@@ -772,20 +929,20 @@ ADVICE = {
 }
 advice_text = ADVICE.get(worst_poll, ["No advice available"])[min(sev[worst_poll], len(ADVICE.get(worst_poll, [])) - 1)]
 
+# AQI category lookup — one searchsorted instead of chained comparisons
+_AQI_CAT_BP = np.array([50, 100, 150])
+_AQI_CAT_COLORS = (PALETTE['good'], PALETTE['moderate'], PALETTE['moderate'], PALETTE['unhealthy'])
+_AQI_CAT_LABELS = ("GOOD", "MODERATE", "UNHEALTHY FOR SENSITIVE GROUPS", "UNHEALTHY")
+
+
+def aqi_category(aqi):
+    idx = int(np.searchsorted(_AQI_CAT_BP, aqi, side='right'))
+    return _AQI_CAT_COLORS[idx], _AQI_CAT_LABELS[idx]
+
+
 # banner
 def render_banner(aqi):
-    if aqi >= 150:
-        color = PALETTE['unhealthy']
-        label = "UNHEALTHY"
-    elif aqi >= 100:
-        color = PALETTE['moderate']
-        label = "UNHEALTHY FOR SENSITIVE GROUPS"
-    elif aqi >= 50:
-        color = PALETTE['moderate']
-        label = "MODERATE"
-    else:
-        color = PALETTE['good']
-        label = "GOOD"
+    color, label = aqi_category(aqi)
     if "popup_visible" not in st.session_state:
         st.session_state.popup_visible = True
     if st.session_state.popup_visible:
@@ -809,6 +966,66 @@ def aqi_panel_class(aqi):
 
 panel_class = aqi_panel_class(aqi_now)
 
+
+# fragments: widget interactions inside these rerun only the fragment,
+# not the whole script (no redundant fetches on unrelated clicks)
+@st.fragment
+def render_forecast(pm24):
+    with st.expander("24-hour PM2.5 forecast", expanded=True):
+        hours = [(datetime.utcnow() + timedelta(hours=i+1)).strftime("%H:%M") for i in range(24)]
+        if len(pm24):
+            pm24 = np.asarray(pm24, dtype=float)
+            lower = np.maximum(0.1, pm24 * 0.85).round(1)
+            upper = (pm24 * 1.15).round(1)
+            figf = go.Figure()
+            figf.add_trace(go.Scatter(x=hours, y=pm24, mode="lines+markers", name="PM2.5", line=dict(color=PALETTE['accent'], width=3)))
+            figf.add_trace(go.Scatter(x=hours+hours[::-1], y=np.concatenate([upper, lower[::-1]]), fill='toself', name='Confidence', showlegend=False, line=dict(color='rgba(0,0,0,0)'), fillcolor='rgba(0,194,255,0.08)'))
+            figf.update_layout(paper_bgcolor='rgba(0,0,0,0)', font=dict(color=PALETTE['text']), height=320)
+            st.plotly_chart(figf, use_container_width=True)
+        else:
+            st.write("Forecast not available.")
+
+
+@st.fragment
+def render_pollutant_panel(polls, live_flags):
+    items = [("PM2.5", "pm25"), ("PM10", "pm10"), ("NO₂", "no2"), ("SO₂", "so2"), ("O₃", "o3"), ("CO", "co")]
+    for i in range(0, len(items), 2):
+        colA, colB = st.columns(2)
+        a_label, a_key = items[i]
+        with colA:
+            val = polls.get(a_key, "—")
+            live = live_flags.get(a_key, False)
+            badge_html = '<span class="badge-live">LIVE</span>' if live else ''
+            source_label = '<span class="small-muted">OpenAQ</span>' if live else '<span class="small-muted">Fallback</span>'
+            unit = POLLUTANT_UNITS.get(a_key, "")
+            st.markdown(f"<div class='poll-box'><div class='kv'>{val} {unit}</div><div style='font-weight:700'>{a_label}</div><div class='small-muted' style='margin-top:6px'>{badge_html} {source_label}</div></div>", unsafe_allow_html=True)
+
+            try:
+                baseline = float(val) if isinstance(val, (int, float)) or (isinstance(val, str) and val.replace('.','',1).isdigit()) else 10.0
+                noise = _RNG.normal(0, max(0.1, baseline*0.05), size=10)
+                hist = np.maximum(0.1, baseline + noise).round(1)
+                st.plotly_chart(sparkline(hist), use_container_width=True)
+            except:
+                pass
+        if i+1 < len(items):
+            b_label, b_key = items[i+1]
+            with colB:
+                valb = polls.get(b_key, "—")
+                liveb = live_flags.get(b_key, False)
+                badgeb = '<span class="badge-live">LIVE</span>' if liveb else ''
+                source_label_b = '<span class="small-muted">OpenAQ</span>' if liveb else '<span class="small-muted">Fallback</span>'
+                unitb = POLLUTANT_UNITS.get(b_key, "")
+                st.markdown(f"<div class='poll-box'><div class='kv'>{valb} {unitb}</div><div style='font-weight:700'>{b_label}</div><div class='small-muted' style='margin-top:6px'>{badgeb} {source_label_b}</div></div>", unsafe_allow_html=True)
+
+                try:
+                    baseb = float(valb) if isinstance(valb, (int, float)) or (isinstance(valb, str) and valb.replace('.','',1).isdigit()) else 12.0
+                    noiseb = _RNG.normal(0, max(0.1, baseb*0.05), size=10)
+                    histb = np.maximum(0.1, baseb + noiseb).round(1)
+                    st.plotly_chart(sparkline(histb), use_container_width=True)
+                except:
+                    pass
+
+
 left, right = st.columns([2.2, 1], gap="large")
 
 with left:
@@ -827,12 +1044,7 @@ with left:
             st.markdown(f'<div style="margin-top:6px"><span class="small-muted">Fallback</span></div>', unsafe_allow_html=True)
 
     with b_col:
-        def aqi_color(aqi):
-            if aqi >= 150: return PALETTE['unhealthy']
-            if aqi >= 100: return PALETTE['moderate']
-            if aqi >= 50: return PALETTE['moderate']
-            return PALETTE['good']
-        color_now = aqi_color(aqi_now)
+        color_now, _ = aqi_category(aqi_now)
         st.markdown(f'<div style="text-align:center; padding:8px; border-radius:10px; background:{color_now}; color:#021212"><div style="font-weight:900;font-size:28px">{aqi_now}</div><div class="small-muted">AQI</div></div>', unsafe_allow_html=True)
         st.markdown(f"<div class='small-muted' style='margin-top:6px'>Category: <b>{'Good' if aqi_now<50 else ('Moderate' if aqi_now<100 else ('Unhealthy' if aqi_now<150 else 'Very Unhealthy'))}</b></div>", unsafe_allow_html=True)
 
@@ -846,43 +1058,19 @@ with left:
         prov_note += f" — 24h mean: {round(pm25_24h_mean_val,1)} µg/m³ (n={pm25_24h_count})"
     st.markdown(f"<div class='small-muted' style='margin-bottom:8px'>{prov_note}</div>", unsafe_allow_html=True)
 
-    # Gauge
-    fig = go.Figure(go.Indicator(mode="gauge+number", value=aqi_now, title={'text': "AQI (from PM2.5)"},
-                                gauge={'axis': {'range': [0,300]},
-                                       'bar': {'color': PALETTE['accent']},
-                                       'steps': [
-                                           {'range':[0,50], 'color': PALETTE['good']},
-                                           {'range':[50,100], 'color': PALETTE['moderate']},
-                                           {'range':[100,150], 'color': '#F97316'},
-                                           {'range':[150,300], 'color': PALETTE['unhealthy']}
-                                       ]}))
-    fig.update_layout(height=330, paper_bgcolor='rgba(0,0,0,0)', font=dict(color=PALETTE['text']))
+    # Gauge (cached skeleton, only the value changes per render)
+    fig = _gauge_skeleton()
+    fig.data[0].value = aqi_now
     st.plotly_chart(fig, use_container_width=True)
 
-    # Download snapshot CSV (uses pandas)
-    snapshot_df = pd.DataFrame([{ 
-        "location": selected_location,
-        "lat": lat,
-        "lon": lon,
-        "pm25": polls["pm25"],
-        "pm10": polls["pm10"],
-        "no2": polls["no2"],
-        "so2": polls["so2"],
-        "o3": polls["o3"],
-        "co": polls["co"],
-        "aqi": aqi_now,
-        "aqi_pm25_used": round(pm25_for_aqi, 2),
-        "aqi_source": used_pm_source,
-        "timestamp": format_time_utc()
-    }])
-    st.download_button("Download snapshot CSV", data=io.BytesIO(snapshot_df.to_csv(index=False).encode()), file_name="aq_snapshot.csv", mime="text/csv")
+    # Download snapshot CSV (cached bytes, re-encoded only when inputs change)
+    polls_tuple = tuple(polls[k] for k in ("pm25", "pm10", "no2", "so2", "o3", "co"))
+    st.download_button("Download snapshot CSV", data=snapshot_csv(selected_location, lat, lon, polls_tuple, aqi_now, round(pm25_for_aqi, 2), used_pm_source, format_time_utc()), file_name="aq_snapshot.csv", mime="text/csv")
 
     st.markdown(f'<div class="tooltip">Quick advice: {advice_text}</div>', unsafe_allow_html=True)
     st.write("")
-    # Map with circle and satellite popup
-    fmap = folium.Map(location=[lat, lon], zoom_start=8, tiles=PALETTE['map_tiles'])
-    folium.Circle(location=[lat, lon], radius=7000 + aqi_now * 40, color=color_now, fill=True, fill_opacity=0.28, popup=f"AQI: {aqi_now}").add_to(fmap)
-    folium.Marker([lat + 0.02, lon + 0.02], popup=f"Satellite proxy AOD: {round(aod_val,3)} — {aod_source}").add_to(fmap)
+    # Map with circle and satellite popup (cached per location/AQI/AOD tuple)
+    fmap = _build_map(lat, lon, aqi_now, round(aod_val, 3), color_now, aod_source)
     st_folium(fmap, width="100%", height=340)
 
     st.markdown('</div>', unsafe_allow_html=True)
@@ -890,18 +1078,7 @@ with left:
     # Forecast block
     if show_24h:
         st.write("")
-        with st.expander("24-hour PM2.5 forecast", expanded=True):
-            hours = [(datetime.utcnow() + timedelta(hours=i+1)).strftime("%H:%M") for i in range(24)]
-            if pm24:
-                lower = [max(0.1, round(v * 0.85, 1)) for v in pm24]
-                upper = [round(v * 1.15, 1) for v in pm24]
-                figf = go.Figure()
-                figf.add_trace(go.Scatter(x=hours, y=pm24, mode="lines+markers", name="PM2.5", line=dict(color=PALETTE['accent'], width=3)))
-                figf.add_trace(go.Scatter(x=hours+hours[::-1], y=upper+lower[::-1], fill='toself', name='Confidence', showlegend=False, line=dict(color='rgba(0,0,0,0)'), fillcolor='rgba(0,194,255,0.08)'))
-                figf.update_layout(paper_bgcolor='rgba(0,0,0,0)', font=dict(color=PALETTE['text']), height=320)
-                st.plotly_chart(figf, use_container_width=True)
-            else:
-                st.write("Forecast not available.")
+        render_forecast(pm24)
 
 with right:
     st.markdown(f'<div class="{panel_class}">', unsafe_allow_html=True)
@@ -909,41 +1086,7 @@ with right:
     st.markdown('<div class="small-muted" style="margin-bottom:8px">Tap a pollutant to see mini-trend & source</div>', unsafe_allow_html=True)
 
     # pollutant cards (2-column)
-    items = [("PM2.5", "pm25"), ("PM10", "pm10"), ("NO₂", "no2"), ("SO₂", "so2"), ("O₃", "o3"), ("CO", "co")]
-    for i in range(0, len(items), 2):
-        colA, colB = st.columns(2)
-        a_label, a_key = items[i]
-        with colA:
-            val = polls.get(a_key, "—")
-            live = live_flags.get(a_key, False)
-            badge_html = '<span class="badge-live">LIVE</span>' if live else ''
-            source_label = '<span class="small-muted">OpenAQ</span>' if live else '<span class="small-muted">Fallback</span>'
-            unit = POLLUTANT_UNITS.get(a_key, "")
-            st.markdown(f"<div class='poll-box'><div class='kv'>{val} {unit}</div><div style='font-weight:700'>{a_label}</div><div class='small-muted' style='margin-top:6px'>{badge_html} {source_label}</div></div>", unsafe_allow_html=True)
-
-            
-            try:
-                baseline = float(val) if isinstance(val, (int, float)) or (isinstance(val, str) and val.replace('.','',1).isdigit()) else 10.0
-                hist = [round(max(0.1, baseline + np.random.normal(0, max(0.1, baseline*0.05))),1) for _ in range(10)]
-                st.plotly_chart(sparkline(hist), use_container_width=True)
-            except:
-                pass
-        if i+1 < len(items):
-            b_label, b_key = items[i+1]
-            with colB:
-                valb = polls.get(b_key, "—")
-                liveb = live_flags.get(b_key, False)
-                badgeb = '<span class="badge-live">LIVE</span>' if liveb else ''
-                source_label_b = '<span class="small-muted">OpenAQ</span>' if liveb else '<span class="small-muted">Fallback</span>'
-                unitb = POLLUTANT_UNITS.get(b_key, "")
-                st.markdown(f"<div class='poll-box'><div class='kv'>{valb} {unitb}</div><div style='font-weight:700'>{b_label}</div><div class='small-muted' style='margin-top:6px'>{badgeb} {source_label_b}</div></div>", unsafe_allow_html=True)
-
-                try:
-                    baseb = float(valb) if isinstance(valb, (int, float)) or (isinstance(valb, str) and valb.replace('.','',1).isdigit()) else 12.0
-                    histb = [round(max(0.1, baseb + np.random.normal(0, max(0.1, baseb*0.05))),1) for _ in range(10)]
-                    st.plotly_chart(sparkline(histb), use_container_width=True)
-                except:
-                    pass
+    render_pollutant_panel(polls, live_flags)
 
     st.markdown('---')
     st.markdown("### Worst pollutant & quick advice")
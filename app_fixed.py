@@ -2,14 +2,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import functools
+import hashlib
 import math, time
 from datetime import datetime
-from streamlit_folium import st_folium
-import folium
-import plotly.graph_objects as go
-import plotly.express as px
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from pathlib import Path
+import streamlit.components.v1 as components
+# folium, plotly and geopy are imported lazily inside the functions that use
+# them so the header and search render before the heavy modules load
+
+# numba is optional — without it the kernel below runs as plain Python
+try:
+    from numba import njit
+except Exception:
+    def njit(*dargs, **dkwargs):
+        if dargs and callable(dargs[0]):
+            return dargs[0]
+        def _wrap(f):
+            return f
+        return _wrap
 
 # -------------------- Config & state --------------------
 st.set_page_config(page_title="Sharjah Air-Lens", layout="wide", initial_sidebar_state="expanded")
@@ -43,11 +54,25 @@ SCHEMES = {
 
 scheme = SCHEMES.get(st.session_state.scheme, SCHEMES["classic"])
 
+# -------------------- Preset locations --------------------
+PRESETS = {
+    "Sharjah - Muweilah": (25.358, 55.478),
+    "Sharjah - Al Majaz": (25.345, 55.381),
+    "Dubai - Deira": (25.271, 55.304),
+    "Ajman - Corniche": (25.405, 55.513),
+}
+DEFAULT_COORDS = (25.3, 56.2)
+MAP_TILES = "CartoDB positron"
+
 # -------------------- CSS --------------------
-CSS = f"""
+@st.cache_data(show_spinner=False)
+def build_css(scheme_name):
+    # interpolated once per scheme; reruns reuse the cached string
+    s = SCHEMES.get(scheme_name, SCHEMES["classic"])
+    return f"""
 <style>
-:root {{ --card-bg: {scheme['card']}; --muted: {scheme['muted']}; --accent: {scheme['accent']}; }}
-.stApp {{ background: linear-gradient(180deg, {scheme['bg_start']} 0%, {scheme['bg_end']} 80%); color: #e6eef8; }}
+:root {{ --card-bg: {s['card']}; --muted: {s['muted']}; --accent: {s['accent']}; }}
+.stApp {{ background: linear-gradient(180deg, {s['bg_start']} 0%, {s['bg_end']} 80%); color: #e6eef8; }}
 .header-title {{ font-size:40px; font-weight:800; margin:0; }}
 .header-sub {{ color:var(--muted); margin-top:6px; margin-bottom:10px; }}
 .card {{ background: var(--card-bg); border-radius:12px; padding:14px; box-shadow: 0 6px 20px rgba(2,6,23,0.6); }}
@@ -57,16 +82,37 @@ CSS = f"""
 .top-right {{ display:flex; justify-content:flex-end; }}
 input.searchbox {{ width:100%; padding:8px; border-radius:8px; border:1px solid rgba(255,255,255,0.06); background:transparent; }}
 .footer {{ color:var(--muted); font-size:12px; margin-top:12px; }}
-body { font-family: "Segoe UI", Roboto, Arial, sans-serif; }
+body {{ font-family: "Segoe UI", Roboto, Arial, sans-serif; }}
 </style>
 """
-st.markdown(CSS, unsafe_allow_html=True)
+
+st.markdown(build_css(st.session_state.scheme), unsafe_allow_html=True)
 
 # -------------------- Load data --------------------
-@st.cache_data
+@st.cache_data(persist="disk", show_spinner=False)
 def load_data(path="aod_sample.csv"):
-    df = pd.read_csv(path, parse_dates=["date"])
+    # prefer a Parquet sibling when present (no date re-parse); otherwise use
+    # Arrow's multithreaded CSV parser, falling back to the default C engine.
+    # persist="disk" keeps the parsed frame across app restarts.
+    pq = Path(path).with_suffix(".parquet")
+    if pq.exists():
+        src = pq
+        df = pd.read_parquet(pq, engine="pyarrow")
+    else:
+        src = Path(path)
+        try:
+            df = pd.read_csv(path, parse_dates=["date"], engine="pyarrow")
+        except Exception:
+            df = pd.read_csv(path, parse_dates=["date"])
     df = df.sort_values("date")
+    # daily AOD needs neither float64 precision nor ns timestamps; float32
+    # halves memory traffic for the rolling kernel and downstream ops
+    df["aod"] = df["aod"].astype(np.float32)
+    df["date"] = df["date"].astype("datetime64[s]")
+    # content fingerprint (first 64KB is plenty for these artifacts) so cached
+    # functions can hash the frame in O(1) instead of touching every cell
+    with open(src, "rb") as fh:
+        df.attrs["version"] = hashlib.md5(fh.read(65536)).hexdigest()
     return df
 
 try:
@@ -75,29 +121,28 @@ except Exception:
     st.error("Missing aod_sample.csv. Put it next to app.py.")
     st.stop()
 
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: lambda d: d.attrs.get("version", id(d))})
+def csv_bytes(frame):
+    # serialize once per data version; the attrs fingerprint set by load_data
+    # makes the cache lookup O(1) instead of hashing every cell
+    return frame.to_csv(index=False).encode()
+
 # -------------------- Sidebar controls --------------------
 with st.sidebar:
     st.markdown("## Settings")
-    if st.button("Toggle Light/Dark"):
-        toggle_theme(); st.experimental_rerun()
-    st.selectbox("Color scheme", ["classic","teal","minimal"], index=["classic","teal","minimal"].index(st.session_state.scheme),
-                 key="scheme_select", on_change=lambda: st.session_state.update({"scheme": st.session_state.scheme_select}) )
+    # callbacks run before the automatic rerun, so no manual rerun is needed:
+    # the CSS at the top of the script already sees the updated state
+    st.button("Toggle Light/Dark", on_click=toggle_theme)
+    st.selectbox("Color scheme", ["classic","teal","minimal"], key="scheme")
     st.markdown("---")
     st.markdown("Data & export")
     st.write("Sample CSV (demo). Real app uses NASA MODIS via GEE.")
-    st.download_button("Download CSV", df.to_csv(index=False), "sharjah_aod_sample.csv", "text/csv")
+    st.download_button("Download CSV", csv_bytes(df), "sharjah_aod_sample.csv", "text/csv")
     st.markdown("---")
     st.markdown("Tips:")
     st.markdown("- Use search to choose a place.")
     st.markdown("- Explain proxies in your submission (AODâ†’pollutants).")
 
-# user changed scheme? update and rerun for CSS to apply
-if st.session_state.scheme != st.session_state.get("scheme_select", st.session_state.scheme):
-    st.session_state.scheme = st.session_state.get("scheme_select", st.session_state.scheme)
-    st.experimental_rerun()
-
-scheme = SCHEMES.get(st.session_state.scheme, SCHEMES["classic"])
-
 # -------------------- Header + search --------------------
 header_col, right_col = st.columns([8,1])
 with header_col:
@@ -118,35 +163,50 @@ search_col, preset_col = st.columns([4,1])
 with search_col:
     location_text = st.text_input("Search location (city, address or landmark)", value="Sharjah, UAE", key="loc_text")
 with preset_col:
-    preset = st.selectbox("", ["Sharjah - Muweilah","Sharjah - Al Majaz","Dubai - Deira","Ajman - Corniche"])
+    preset = st.selectbox("", list(PRESETS))
 
 # -------------------- Geocode (Nominatim) --------------------
-def geocode(text, retries=1):
-    geo = Nominatim(user_agent="sharjah_air_lens_demo")
-    try:
-        return geo.geocode(text, timeout=8)
-    except Exception:
-        if retries>0:
-            time.sleep(1); return geocode(text, retries-1)
+@st.cache_resource(show_spinner=False)
+def get_geocoder():
+    # one instance per process: geopy's requests-backed adapter keeps its
+    # session (and TLS connection) alive across calls, so repeated searches
+    # skip the handshake. Also keeps us well under Nominatim's 1 req/s policy.
+    from geopy.geocoders import Nominatim
+    return Nominatim(user_agent="sharjah_air_lens_demo/1.0", timeout=10)
+
+@st.cache_resource(show_spinner=False)
+def get_geocode_fn():
+    # RateLimiter enforces Nominatim's 1 req/s policy, retries transient
+    # failures with bounded waits (min_delay + max_retries*error_wait) and
+    # returns None instead of raising — no blind sleeps on the UI thread
+    from geopy.extra.rate_limiter import RateLimiter
+    return RateLimiter(get_geocoder().geocode, min_delay_seconds=1.0, max_retries=2,
+                       error_wait_seconds=2.0, swallow_exceptions=True,
+                       return_value_on_exception=None)
+
+@st.cache_data(ttl=86400, max_entries=512, show_spinner=False)
+def geocode_cached(q):
+    # plain tuple (not the geopy Location object) so the cache value pickles
+    # cleanly; repeated searches and rerenders skip the network entirely
+    loc = get_geocode_fn()(q)
+    if loc is None:
         return None
+    return (loc.latitude, loc.longitude, loc.address)
 
-lat, lon = 25.3, 56.2
+lat, lon = DEFAULT_COORDS
 try_search = st.button("Search")
 
 if try_search and location_text.strip():
-    loc = geocode(location_text)
-    if loc:
-        lat, lon = loc.latitude, loc.longitude
-        st.success(f"Found: {loc.address}")
+    res = geocode_cached(location_text.strip().lower())
+    if res:
+        lat, lon, address = res
+        st.success(f"Found: {address}")
     else:
         st.error("Not found â€” using preset.")
         try_search = False
 
 if not try_search:
-    if preset == "Sharjah - Muweilah": lat, lon = 25.358, 55.478
-    if preset == "Sharjah - Al Majaz": lat, lon = 25.345, 55.381
-    if preset == "Dubai - Deira": lat, lon = 25.271, 55.304
-    if preset == "Ajman - Corniche": lat, lon = 25.405, 55.513
+    lat, lon = PRESETS.get(preset, DEFAULT_COORDS)
 
 # -------------------- controls row --------------------
 ctrl1, ctrl2 = st.columns([2,1])
@@ -159,80 +219,168 @@ with ctrl2:
     smooth = st.slider("Smoothing days", 1, 7, 3)
 
 # -------------------- data filtering & proxies --------------------
-mask = (df["date"].dt.date >= start) & (df["date"].dt.date <= end)
-view = df.loc[mask].copy()
+@njit(cache=True, fastmath=True)
+def running_mean(a, w):
+    # single-pass running sum; equivalent to rolling(w, min_periods=1).mean()
+    # without pandas' per-window indexer dispatch
+    n = a.shape[0]
+    out = np.empty(n)
+    s = 0.0
+    for i in range(n):
+        s += a[i]
+        if i >= w:
+            s -= a[i - w]
+        k = i + 1 if i < w else w
+        out[i] = s / k
+    return out
+
+@st.cache_data(show_spinner=False)
+def compute_view(start, end, smooth):
+    # df comes in via closure (already cached by load_data); keyed on the
+    # widget values so the filter + rolling mean only rerun when they change.
+    # Compare raw datetime64 values — .dt.date would materialize a Python
+    # date object per row
+    ts_start = pd.Timestamp(start).to_datetime64()
+    ts_end = (pd.Timestamp(end) + pd.Timedelta(days=1)).to_datetime64()
+    # load_data sorts on date, so two binary searches replace the O(n)
+    # boolean scan and the copy shrinks to just the two columns we use
+    dates = df["date"].values
+    i0 = int(dates.searchsorted(ts_start, side="left"))
+    i1 = int(dates.searchsorted(ts_end, side="left"))
+    v = df.iloc[i0:i1][["date", "aod"]].copy()
+    v["rolling"] = running_mean(v["aod"].to_numpy(), smooth)
+    return v
+
+view = compute_view(start, end, smooth)
 if view.empty:
     st.warning("No data in range â€” showing latest sample.")
-    view = df.copy()
-view["rolling"] = view["aod"].rolling(smooth, min_periods=1).mean()
+    view = compute_view(min_d, max_d, smooth)
 latest = view.iloc[-1]
 aod_val = float(latest["rolling"])
 
-# proxy conversions (demo)
-pm25 = max(1, round(aod_val * 90, 1))
-pm10 = max(1, round(pm25 * 1.6, 1))
-no2  = max(1, round(aod_val * 40 + 5, 1))
-co2  = max(300, round(400 + aod_val * 30, 1))
-o3   = max(1, round(aod_val * 20 + 10, 1))
-so2  = max(1, round(aod_val * 5 + 1, 1))
+# proxy conversions (demo) — computed over the whole smoothed series so
+# per-day pollutant traces can be charted later without recomputation;
+# the cards below just read the last row
+R = view["rolling"].to_numpy()
+PM25 = np.maximum(1, np.round(R * 90, 1))
+PM10 = np.maximum(1, np.round(PM25 * 1.6, 1))
+NO2  = np.maximum(1, np.round(R * 40 + 5, 1))
+CO2  = np.maximum(300, np.round(400 + R * 30, 1))
+O3   = np.maximum(1, np.round(R * 20 + 10, 1))
+SO2  = np.maximum(1, np.round(R * 5 + 1, 1))
+pm25 = float(PM25[-1])
+pm10 = float(PM10[-1])
+no2  = float(NO2[-1])
+co2  = float(CO2[-1])
+o3   = float(O3[-1])
+so2  = float(SO2[-1])
 
-def pm25_status(v):
-    if v<=12: return ("Good","ðŸŸ¢",scheme["good"])
-    if v<=35.4: return ("Moderate","ðŸŸ¡",scheme["mod"])
-    if v<=55.4: return ("Unhealthy for sensitive","ðŸŸ ",scheme["bad"])
-    return ("Unhealthy","ðŸ”´",scheme["bad"])
+_PM25_BUCKETS = np.array([12.0, 35.4, 55.4])
+_PM25_LABELS = (("Good","ðŸŸ¢","good"), ("Moderate","ðŸŸ¡","mod"),
+                ("Unhealthy for sensitive","ðŸŸ ","bad"), ("Unhealthy","ðŸ”´","bad"))
 
-pm25_s, pm25_e, pm25_c = pm25_status(pm25)
+@functools.lru_cache(maxsize=128)
+def pm25_status(v, scheme_name):
+    # side='left' keeps the old <= boundary behaviour; scheme passed by name
+    # so the memo stays correct across scheme switches
+    i = int(np.searchsorted(_PM25_BUCKETS, v, side="left"))
+    lbl, em, key = _PM25_LABELS[i]
+    return (lbl, em, SCHEMES[scheme_name][key])
 
-# -------------------- layout: left gauge & map, right pollutants --------------------
-left_col, right_col = st.columns([2,1], gap="large")
+pm25_s, pm25_e, pm25_c = pm25_status(pm25, st.session_state.scheme)
 
-# LEFT: Gauge + map + timeseries
-with left_col:
-    st.markdown('<div class="card">', unsafe_allow_html=True)
-    st.markdown(f"**Location:** {location_text if try_search else preset}   â€”   Lat {lat:.4f}, Lon {lon:.4f}")
-    # AQI proxy scaling (0-100)
-    aqi_score = min(100, round((pm25 / 150) * 100, 1))
-    # semicircle pie + needle
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_map_html(lat, lon, aod_bucket, scheme_key):
+    # Jinja render + Leaflet JSON emit happen once per quantized
+    # (location, AOD tier, scheme) tuple instead of on every rerun
+    import folium
+    s = SCHEMES[scheme_key]
+    # canvas renderer paints the circle overlay much faster than the default
+    # SVG path and produces a lighter payload to serialize
+    fmap = folium.Map(location=[lat, lon], zoom_start=11, tiles=MAP_TILES,
+                      prefer_canvas=True, control_scale=False, zoom_control=False)
+    folium.Circle(location=[lat, lon], radius=7000 + aod_bucket*30000,
+                  color=s["bad"] if aod_bucket>0.5 else (s["mod"] if aod_bucket>0.3 else s["good"]),
+                  fill=True, fill_opacity=0.35, popup=f"AOD (3d avg): {aod_bucket:.2f}").add_to(fmap)
+    return fmap.get_root().render()
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def build_gauge(aqi_score, theme, scheme_key):
+    # cached as JSON: figure construction + schema validation run once per
+    # (score, theme, scheme); the render path only deserializes
+    import plotly.graph_objects as go
+    s = SCHEMES[scheme_key]
     fig = go.Figure()
     fig.add_trace(go.Pie(values=[33,33,34], hole=0.55, rotation=180,
-                         marker_colors=[scheme["good"], scheme["mod"], scheme["bad"]],
+                         marker_colors=[s["good"], s["mod"], s["bad"]],
                          textinfo='none', hoverinfo='none', showlegend=False))
     ang = 180 - (aqi_score*180/100)
     r = 0.4
     ang_rad = math.radians(ang)
     xh = 0.5 + r*math.cos(ang_rad); yh = 0.5 + r*math.sin(ang_rad)
-    needle_color = "#111827" if st.session_state.theme=="light" else "#ffffff"
+    needle_color = "#111827" if theme=="light" else "#ffffff"
     fig.update_layout(shapes=[
         dict(type='line', x0=0.5, y0=0.5, x1=xh, y1=yh, xref='paper', yref='paper', line=dict(color=needle_color, width=4)),
         dict(type='circle', xref='paper', yref='paper', x0=0.49, y0=0.49, x1=0.51, y1=0.51, fillcolor=needle_color, line_color=needle_color)
     ], margin=dict(t=10,b=10,l=10,r=10), height=340)
-    if st.session_state.theme=="dark":
+    if theme=="dark":
         fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', font_color='white')
     else:
         fig.update_layout(paper_bgcolor='rgba(255,255,255,0)', font_color='black')
-    st.plotly_chart(fig, use_container_width=True)
+    return fig.to_json()
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_timeseries(start, end, smooth, theme, scheme_key):
+    import plotly.express as px
+    v = compute_view(start, end, smooth)
+    if v.empty:
+        v = compute_view(min_d, max_d, smooth)
+    fig_ts = px.line(v, x="date", y="aod", markers=True)
+    fig_ts.add_scatter(x=v["date"], y=v["rolling"], mode="lines", name=f"{smooth}-day avg",
+                       line=dict(color=SCHEMES[scheme_key]["accent"], width=3))
+    fig_ts.update_layout(template="plotly_dark" if theme=="dark" else None, height=240, margin=dict(t=10,b=10))
+    return fig_ts.to_json()
+
+def plotly_from_json(fig_json):
+    import plotly.io as pio
+    return pio.from_json(fig_json)
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def gauge_svg(aqi_score_bucket, theme, scheme_key):
+    # static SVG skips the plotly.js runtime on the frontend entirely; the
+    # score is bucketed to an integer by the caller for a high cache-hit rate
+    fig = plotly_from_json(build_gauge(aqi_score_bucket, theme, scheme_key))
+    return fig.to_image(format="svg", engine="kaleido").decode()
+
+# -------------------- layout: left gauge & map, right pollutants --------------------
+left_col, right_col = st.columns([2,1], gap="large")
+
+# LEFT: Gauge + map + timeseries
+with left_col:
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown(f"**Location:** {location_text if try_search else preset}   â€”   Lat {lat:.4f}, Lon {lon:.4f}")
+    # AQI proxy scaling (0-100)
+    aqi_score = min(100, round((pm25 / 150) * 100, 1))
+    # semicircle pie + needle — cached static SVG when kaleido is available,
+    # live plotly figure otherwise
+    try:
+        st.markdown(gauge_svg(round(aqi_score), st.session_state.theme, st.session_state.scheme), unsafe_allow_html=True)
+    except Exception:
+        st.plotly_chart(plotly_from_json(build_gauge(aqi_score, st.session_state.theme, st.session_state.scheme)), use_container_width=True)
     st.markdown(f"**AQI (proxy):** {aqi_score} â€” derived from PM2.5 proxy. ", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
     st.write("")
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("#### Map")
-    fmap = folium.Map(location=[lat, lon], zoom_start=11, tiles="CartoDB positron")
-    folium.Circle(location=[lat, lon], radius=7000 + aod_val*30000,
-                  color=scheme["bad"] if aod_val>0.5 else (scheme["mod"] if aod_val>0.3 else scheme["good"]),
-                  fill=True, fill_opacity=0.35, popup=f"AOD (3d avg): {aod_val:.2f}").add_to(fmap)
-    st_folium(fmap, width="100%", height=300)
+    # the map's click/zoom state is never read back, so serve cached HTML
+    components.html(render_map_html(round(lat, 4), round(lon, 4), round(aod_val, 2), st.session_state.scheme), height=310, scrolling=False)
     st.markdown("</div>", unsafe_allow_html=True)
 
     st.write("")
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("#### Recent AOD")
-    fig_ts = px.line(view, x="date", y="aod", markers=True)
-    fig_ts.add_scatter(x=view["date"], y=view["rolling"], mode="lines", name=f"{smooth}-day avg",
-                       line=dict(color=scheme["accent"], width=3))
-    fig_ts.update_layout(template="plotly_dark" if st.session_state.theme=="dark" else None, height=240, margin=dict(t=10,b=10))
-    st.plotly_chart(fig_ts, use_container_width=True)
+    st.plotly_chart(plotly_from_json(build_timeseries(start, end, smooth, st.session_state.theme, st.session_state.scheme)), use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 # RIGHT: pollutants grid
@@ -248,27 +396,22 @@ with right_col:
         ("Oâ‚ƒ", f"{o3} ppb", "ðŸŒ¤ï¸", "â€”", scheme["accent"]),
         ("COâ‚‚", f"{co2} ppm", "ðŸ«", "â€”", scheme["accent"]),
     ]
-    rows = []
-    for i in range(0, len(pols), 2):
-        c1, c2 = st.columns(2)
-        p1 = pols[i]
-        with c1:
-            st.markdown(f"<div class='poll-card'><b>{p1[0]}</b><div class='small-muted'>{p1[1]}</div>"
-                        f"<div style='margin-top:8px'><span style='padding:6px 10px;border-radius:999px;background:{p1[4]};color:white;font-weight:700'>{p1[2]} {p1[3]}</span></div></div>", unsafe_allow_html=True)
-        if i+1 < len(pols):
-            p2 = pols[i+1]
-            with c2:
-                st.markdown(f"<div class='poll-card'><b>{p2[0]}</b><div class='small-muted'>{p2[1]}</div>"
-                            f"<div style='margin-top:8px'><span style='padding:6px 10px;border-radius:999px;background:{p2[4]};color:white;font-weight:700'>{p2[2]} {p2[3]}</span></div></div>", unsafe_allow_html=True)
+    # one markdown call for the whole grid (the .poll-grid CSS already lays
+    # out two columns) instead of six protocol round-trips plus column frames
+    cards = "".join(
+        f"<div class='poll-card'><b>{p[0]}</b><div class='small-muted'>{p[1]}</div>"
+        f"<div style='margin-top:8px'><span style='padding:6px 10px;border-radius:999px;background:{p[4]};color:white;font-weight:700'>{p[2]} {p[3]}</span></div></div>"
+        for p in pols
+    )
+    st.markdown(f"<div class='poll-grid'>{cards}</div>", unsafe_allow_html=True)
 
     st.markdown("---")
-    sel = st.selectbox("Details for", [p[0] for p in pols])
-    for p in pols:
-        if p[0] == sel:
-            st.markdown(f"**{p[0]} â€” {p[1]}**")
-            st.markdown(f"Status: {p[2]} {p[3]}")
-            st.markdown("- Health advice: " + ("Limit outdoor exercise if not Good." if p[3] != "Good" else "Air quality is good."))
-            break
+    pols_by_name = {p[0]: p for p in pols}
+    sel = st.selectbox("Details for", list(pols_by_name))
+    p = pols_by_name[sel]
+    st.markdown(f"**{p[0]} â€” {p[1]}**")
+    st.markdown(f"Status: {p[2]} {p[3]}")
+    st.markdown("- Health advice: " + ("Limit outdoor exercise if not Good." if p[3] != "Good" else "Air quality is good."))
 
     st.markdown("---")
     st.markdown(f"**Latest data point:** {latest['date'].strftime('%Y-%m-%d')}")